@@ -0,0 +1,476 @@
+# PROGRAMMER: JC Lopez
+# REVISED DATE: 10/19/2026
+# PURPOSE: Local shared-memory server for the Airbnb city datasets
+
+# Import python libraries
+import argparse
+import ctypes
+import gc
+from multiprocessing import resource_tracker, shared_memory
+from multiprocessing.connection import Client, Listener
+import os
+import signal
+import threading
+import warnings
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+
+# Default location of the server socket, in a directory only the user
+# can access, and default datasets
+RUN_DIR = os.path.join(os.path.expanduser('~'), '.airbnb_data')
+ADDRESS = os.path.join(RUN_DIR, 'server.sock')
+CITIES = ['Boston', 'Seattle']
+FILENAMES = ['calendar', 'listings', 'reviews']
+
+# Seconds a client has to send its request
+TIMEOUT = 5
+
+# Byte alignment of column buffers inside a shared-memory segment
+ALIGN = 64
+
+# Segments attached by this process, keyed by segment name
+_segments = dict()
+
+
+# Functions
+def load_data(data_dir='data', cities=CITIES, filenames=FILENAMES):
+    """Read the csv files of every city into a hierarchical dict, the
+    same way the notebook does.
+
+    Args:
+        data_dir (str): Directory with one sub-directory per city.
+        cities (list): City names, e.g. ['Boston', 'Seattle'].
+        filenames (list): Dataset types — calendar, listings, reviews.
+
+    Returns:
+        data (dict): Hierarchical dict with city as the first level and
+            dataset type — calendar, listings, reviews — as the second.
+
+    """
+    data = dict()
+    # Loop over cities
+    for city in cities:
+        data[city] = dict()
+        # Loop over files
+        for filename in filenames:
+            path = data_dir + '/' + city + '/' + filename + '.csv'
+            data[city][filename] = pd.read_csv(path, sep=',', quotechar='"')
+
+    return data
+
+
+def engineer_features(data):
+    """Add the engineered columns used by the functions in
+    `utility_fs.py` — the re-encodings and time features built in the
+    notebook — so that clients do not have to rebuild them.
+
+    Calendar columns: 'price_re', 'available_re', 'date_re',
+    'day_of_week', 'day_of_year', 'day_of_sample', 'total_reviews', and
+    'fri_sat'. Reviews columns: 'date_re'. Duplicated calendar rows are
+    dropped.
+
+    Args:
+        data (dict): Hierarchical dict with city as the first level and
+            dataset type — calendar, listings, reviews — as the second.
+
+    Returns:
+        None. Modifies the calendar and reviews dataframes in place.
+
+    """
+    # Loop over cities
+    for city in data.keys():
+        calendar = data[city]['calendar']
+        reviews = data[city]['reviews']
+
+        # Re-encode 'price', 'available', and 'date'
+        calendar['price_re'] = calendar['price'].str[1:]\
+            .str.replace(',', '').astype(np.float32)
+        calendar['available_re'] = (calendar['available'] == 't').astype(int)
+        calendar['date_re'] = pd.to_datetime(calendar['date'])
+        reviews['date_re'] = pd.to_datetime(reviews['date'])
+
+        # Time features: day of week, day of year, and day of sample
+        dates = calendar['date_re']
+        calendar['day_of_week'] = dates.dt.dayofweek
+        calendar['day_of_year'] = dates.dt.dayofyear
+        calendar['day_of_sample'] = (dates - dates.min()).dt.days
+
+        # Total reviews received by listing
+        reviews_totals = reviews.groupby(by=['listing_id'])['id'].count()
+        calendar['total_reviews'] = calendar['listing_id']\
+            .map(reviews_totals).fillna(0).astype(int)
+
+        # Weekend evenings: Fri = 4, Sat = 5
+        calendar['fri_sat'] = calendar['day_of_week'].isin([4, 5]).astype(int)
+
+        data[city]['calendar'] = calendar.drop_duplicates(keep='first')
+
+
+def _column_buffers(series):
+    """Split a column into the buffers to place in shared memory.
+
+    Numeric, boolean, and datetime columns are stored as a single NumPy
+    buffer. Any other column — strings, mixed objects — is stored as an
+    Arrow string array: validity, offsets, and UTF-8 data buffers. In
+    mixed-type columns, non-string values are turned into strings, with
+    a warning.
+
+    Args:
+        series (pd.Series or pd.Index): Column or index of a dataframe.
+
+    Returns:
+        kind (str): NumPy dtype string, or 'string' for Arrow strings.
+        null_count (int): Number of missing values in Arrow strings.
+        buffers (list): Buffers to copy into shared memory; None for an
+            absent validity buffer.
+
+    """
+    dtype = series.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind in 'biufcmM':
+        values = np.ascontiguousarray(series.to_numpy())
+        return values.dtype.str, 0, [values.view(np.uint8)]
+
+    # Strings as Arrow arrays; other objects, as in the mixed-type
+    # columns `read_csv` may return, as their string value
+    values = series.tolist()
+    mixed = [i for i, x in enumerate(values)
+             if not (isinstance(x, str) or pd.isna(x))]
+    if mixed:
+        warnings.warn('{:,} non-string values in column {!r} are served '
+                      'as strings'.format(len(mixed), series.name))
+        for i in mixed:
+            values[i] = str(values[i])
+    array = pa.array(values, type=pa.large_string(), from_pandas=True)
+    buffers = [None if buffer is None else np.frombuffer(buffer, np.uint8)
+               for buffer in array.buffers()]
+
+    return 'string', array.null_count, buffers
+
+
+def _share_frame(df):
+    """Copy a dataframe, index included, into a new shared-memory
+    segment.
+
+    Args:
+        df (pd.DataFrame): Dataframe to share.
+
+    Returns:
+        shm (SharedMemory): Segment holding the column buffers.
+        spec (dict): Layout of the segment — names, dtypes, and buffer
+            offsets — needed to rebuild the dataframe in any process.
+
+    """
+    # Lay out the buffers of index and columns at aligned offsets
+    arrays = []
+    if not isinstance(df.index, pd.RangeIndex):
+        arrays.append(('index', df.index.name, df.index))
+    arrays += [('column', name, df[name]) for name in df.columns]
+
+    layout = []
+    buffers = []
+    offset = 0
+    for role, name, values in arrays:
+        kind, null_count, column_buffers = _column_buffers(values)
+        spans = []
+        for buffer in column_buffers:
+            if buffer is None:
+                spans.append(None)
+                continue
+            spans.append((offset, buffer.size))
+            buffers.append((offset, buffer))
+            offset += -(-buffer.size // ALIGN) * ALIGN
+        layout.append({
+            'role': role,
+            'name': name,
+            'kind': kind,
+            'null_count': null_count,
+            'buffers': spans
+            })
+
+    # Create the segment and copy the buffers into it
+    shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+    for start, buffer in buffers:
+        shm.buf[start:start + buffer.size] = buffer
+
+    index = df.index
+    spec = {
+        'shm': shm.name,
+        'nrows': len(df),
+        'range': (index.start, index.stop, index.step)
+                 if isinstance(index, pd.RangeIndex) else None,
+        'index_name': index.name,
+        'layout': layout
+        }
+
+    return shm, spec
+
+
+def share_data(data):
+    """Copy every dataframe of a hierarchical dict into shared memory.
+
+    Args:
+        data (dict): Hierarchical dict with city as the first level and
+            dataset type — calendar, listings, reviews — as the second.
+
+    Returns:
+        segments (list): SharedMemory segments; the caller owns them and
+            must close and unlink them when done.
+        manifest (dict): Hierarchical dict, like `data`, with the
+            layout of each dataframe.
+
+    """
+    segments = []
+    manifest = dict()
+    # Loop over cities
+    for city, values in data.items():
+        manifest[city] = dict()
+        # Loop over datasets
+        for name, df in values.items():
+            shm, spec = _share_frame(df)
+            _segments[shm.name] = shm
+            segments.append(shm)
+            manifest[city][name] = spec
+
+    return segments, manifest
+
+
+def _attach_segment(name):
+    """Attach to an existing shared-memory segment, once per process.
+
+    The segment belongs to the server, so it is removed from this
+    process' resource tracker; otherwise the tracker would unlink it
+    when the client exits.
+
+    Args:
+        name (str): Name of the shared-memory segment.
+
+    Returns:
+        shm (SharedMemory)
+
+    """
+    if name not in _segments:
+        shm = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(shm._name, 'shared_memory')
+        _segments[name] = shm
+
+    return _segments[name]
+
+
+def _read_array(base, spec, item):
+    """Wrap the buffers of one column in a read-only array, without
+    copying them.
+
+    Args:
+        base (pa.Buffer): Arrow view of the whole shared-memory segment.
+        spec (dict): Layout of the segment, as built by `_share_frame()`.
+        item (dict): Layout of the column within the segment.
+
+    Returns:
+        values (np.ndarray or pd.arrays.ArrowExtensionArray)
+
+    """
+    buffers = [None if span is None else base.slice(*span)
+               for span in item['buffers']]
+    if item['kind'] == 'string':
+        array = pa.Array.from_buffers(pa.large_string(), spec['nrows'],
+                                      buffers, item['null_count'])
+        return pd.arrays.ArrowExtensionArray(array)
+
+    values = np.frombuffer(buffers[0], dtype=item['kind'])
+    values.flags.writeable = False
+
+    return values
+
+
+def _read_frame(spec):
+    """Build a read-only dataframe on top of a shared-memory segment.
+    Neither the column buffers nor the index are copied; string columns
+    come back with an Arrow-backed `large_string[pyarrow]` dtype.
+
+    Args:
+        spec (dict): Layout of the segment, as built by `_share_frame()`.
+
+    Returns:
+        df (pd.DataFrame)
+
+    """
+    # Wrap the segment by address, so that no buffer export outlives
+    # this call and blocks `SharedMemory.close()` at exit
+    shm = _attach_segment(spec['shm'])
+    address = ctypes.addressof(ctypes.c_char.from_buffer(shm.buf))
+    base = pa.foreign_buffer(address, shm.size, base=shm)
+    if spec['range'] is not None:
+        index = pd.RangeIndex(*spec['range'], name=spec['index_name'])
+    columns = dict()
+    for item in spec['layout']:
+        values = _read_array(base, spec, item)
+        if item['role'] == 'index':
+            index = pd.Index(values, name=item['name'], copy=False)
+        else:
+            columns[item['name']] = values
+
+    return pd.DataFrame(columns, index=index, copy=False)
+
+
+def read_data(manifest):
+    """Build read-only dataframes for every entry of a manifest.
+
+    Args:
+        manifest (dict): Hierarchical dict, as returned by `share_data()`.
+
+    Returns:
+        data (dict): Hierarchical dict with city as the first level and
+            dataset type — calendar, listings, reviews — as the second.
+
+    """
+    return {city: {name: _read_frame(spec) for name, spec in values.items()}
+            for city, values in manifest.items()}
+
+
+def _check_run_dir(address):
+    """Create the directory of the server socket, readable and writable
+    only by the user, and remove a stale socket left by a dead server.
+
+    Args:
+        address (str): Path of the server socket.
+
+    Returns:
+        None. Raises PermissionError if the directory is accessible to
+        other users, and RuntimeError if a server is already running.
+
+    """
+    run_dir = os.path.dirname(address)
+    os.makedirs(run_dir, mode=0o700, exist_ok=True)
+    status = os.stat(run_dir)
+    if status.st_uid != os.getuid() or status.st_mode & 0o077:
+        raise PermissionError(
+            '{} must be owned by the user and have mode 0700'.format(run_dir))
+
+    if os.path.exists(address):
+        try:
+            Client(address, family='AF_UNIX').close()
+        except ConnectionRefusedError:
+            os.unlink(address)
+        else:
+            raise RuntimeError('A server is already running on {}'
+                               .format(address))
+
+
+def _answer(conn, manifest):
+    """Send the manifest to one client, if it asks for it in time.
+
+    Args:
+        conn (Connection): Connection accepted by the server.
+        manifest (dict): Hierarchical dict, as returned by `share_data()`.
+
+    Returns:
+        None.
+
+    """
+    with conn:
+        try:
+            if (conn.poll(TIMEOUT)
+                    and conn.recv_bytes(maxlength=64) == b'manifest'):
+                conn.send(manifest)
+        except (EOFError, OSError) as e:
+            print('Dropped client: {}'.format(e))
+
+
+def serve(data, address=ADDRESS):
+    """Share the data and answer manifest requests from clients until
+    interrupted. The shared-memory segments are released on exit.
+
+    Clients connect through a Unix socket in a directory only the user
+    can access; their requests are compared as raw bytes, never
+    unpickled. Each client is answered on its own thread, so a slow or
+    misbehaving client does not hold up the others.
+
+    Once the frames are in shared memory, `data` is emptied so the
+    server does not hold a second copy of them.
+
+    Args:
+        data (dict): Hierarchical dict with city as the first level and
+            dataset type — calendar, listings, reviews — as the second.
+            Emptied by the call.
+        address (str): Path of the server socket.
+
+    Returns:
+        None.
+
+    """
+    _check_run_dir(address)
+    segments, manifest = share_data(data)
+    # Drop the private copy of the frames, now in shared memory, and
+    # return the freed memory to the system
+    data.clear()
+    gc.collect()
+    pa.default_memory_pool().release_unused()
+    try:
+        ctypes.CDLL('libc.so.6').malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
+    try:
+        with Listener(address, family='AF_UNIX') as listener:
+            print('Serving {} datasets on {}'.format(
+                len(segments), listener.address))
+            while True:
+                try:
+                    conn = listener.accept()
+                except OSError as e:
+                    print('Failed to accept client: {}'.format(e))
+                    continue
+                threading.Thread(target=_answer, args=(conn, manifest),
+                                 daemon=True).start()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for shm in segments:
+            shm.close()
+            shm.unlink()
+
+
+def attach(address=ADDRESS):
+    """Attach to the data held by a running server.
+
+    The dataframes share their buffers with the server, so attaching is
+    cheap and does not duplicate the data. The shared data cannot be
+    modified: writing to a numeric or datetime column raises an error,
+    while writing to a string column copies that column into the
+    client's private memory first. Adding new columns works.
+
+    Args:
+        address (str): Path of the server socket.
+
+    Returns:
+        data (dict): Hierarchical dict with city as the first level and
+            dataset type — calendar, listings, reviews — as the second.
+
+    """
+    with Client(address, family='AF_UNIX') as conn:
+        conn.send_bytes(b'manifest')
+        manifest = conn.recv()
+
+    return read_data(manifest)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Serve the Airbnb city datasets from shared memory.')
+    parser.add_argument('--data-dir', default='data',
+                        help='directory with one sub-directory per city')
+    parser.add_argument('--socket', default=ADDRESS,
+                        help='path of the server socket')
+    parser.add_argument('--raw', action='store_true',
+                        help='serve the csv data without the engineered '
+                             'columns of the notebook')
+    args = parser.parse_args()
+
+    # Release the shared memory on `kill` as well as on Ctrl-C
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+
+    data = load_data(args.data_dir)
+    if not args.raw:
+        engineer_features(data)
+    serve(data, address=args.socket)